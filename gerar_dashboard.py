@@ -1,13 +1,19 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import os
+import re
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from decimal import Decimal, ROUND_HALF_UP
 
+import orjson
 import pandas as pd
 import numpy as np
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
 
 # =========================
 # CONFIG
@@ -26,112 +32,177 @@ SHEETS = {
 
 ROWS_PER_PART = 2000  # margem segura
 
+# versão do formato das partes: SUBIR sempre que mudar serialização ou
+# transformação de colunas (invalida o atalho "Excel igual => nem abre")
+FORMAT_VERSION = 1
+
+# datas antes disso são lixo (ex.: "JAN" da linha de total vira ano 1)
+MIN_YEAR = 1900
+
+# células que o read_excel lê como NaN: erros de fórmula ("#DIV/0!") e os
+# textos NA padrão do pandas (iter_rows devolve tudo isso como string)
+EXCEL_NA_CELLS = [
+    *ERROR_CODES,
+    "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null", "",
+]
+
+# textos que contam como célula vazia
+EMPTY_CELLS = ["", "-", "nan", "NaN", "None"]
+
+# pt-BR => float: remove milhar (".") e troca decimal ("," => ".") numa passada só
+BR_NUMBER_TABLE = str.maketrans({".": None, ",": "."})
+
+# acentos comuns do pt-BR => ASCII (o resto cai no NFKD)
+ACCENTS_TABLE = str.maketrans("áàâãäéèêëíìîïóòôõöúùûüç", "aaaaaeeeeiiiiooooouuuuc")
+
+# moeda: "r$", ou "faturamento"/"cpc" como palavra ("rs" fica de fora: é a UF do RS)
+MONEY_COL_RE = re.compile(r"(?:^|[^a-z])(?:r\$|(?:faturamento|cpc)(?![a-z]))")
+
+# percentual: "ctr" em qualquer parte do nome ("CTR %", "CTRs", "CTRMedio")
+PERCENT_COL_RE = re.compile(r"ctr")
+
 
 # =========================
 # HELPERS
 # =========================
+@lru_cache(maxsize=4096)
 def norm(s: str) -> str:
     s = "" if s is None else str(s)
-    s = s.strip().lower()
+    s = s.strip().lower().translate(ACCENTS_TABLE)
+    if s.isascii():
+        return s
     s = unicodedata.normalize("NFKD", s)
     return "".join(c for c in s if not unicodedata.combining(c))
 
 
-def fmt_date(x) -> str:
-    """Normaliza datas para dd/mm/yyyy."""
-    if pd.isna(x):
-        return ""
-    dt = pd.to_datetime(x, dayfirst=True, errors="coerce")
-    if pd.isna(dt):
-        return ""
-    return dt.strftime("%d/%m/%Y")
+def parse_datetime_series(s: pd.Series) -> pd.Series:
+    """Converte a coluna inteira para datetime (dd/mm/yyyy). Inválidos => NaT."""
+    # já veio datetime64 do Excel => usa direto, sem reparse
+    if not pd.api.types.is_datetime64_any_dtype(s):
+        # "mixed" => formato por célula ("15/01/2026" e "2026-01-18" na mesma coluna)
+        s = pd.to_datetime(s, dayfirst=True, format="mixed", errors="coerce")
+    # linha de total ("JAN") vira ano 1 no pandas 3 => não é data de verdade
+    return s.where(s.dt.year >= MIN_YEAR)
 
 
-def ym_from_date_str(date_str: str) -> str:
-    """Extrai YYYY-MM de uma data dd/mm/yyyy."""
-    if not date_str:
-        return ""
-    dt = pd.to_datetime(date_str, dayfirst=True, errors="coerce")
-    if pd.isna(dt):
-        return ""
-    return f"{dt.year}-{str(dt.month).zfill(2)}"
+def ym_from_dates(dt: pd.Series) -> pd.Series:
+    """Extrai YYYY-MM de uma Series datetime. NaT => ""."""
+    return dt.dt.strftime("%Y-%m").fillna("")
 
 
-def as_decimal_money(value):
-    """
-    Converte valor vindo do Excel (float/int/str) para Decimal com 2 casas.
-    Evita bug de float.
-    Retorna Decimal ou None.
-    """
-    if value is None or value == "" or value == "-":
-        return None
-
-    if isinstance(value, (int, float, Decimal, np.integer, np.floating)):
-        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-
-    if isinstance(value, str):
-        s = value.strip().replace("R$", "").strip()
-        if not s:
-            return None
-        s = s.replace(".", "").replace(",", ".")
-        try:
-            return Decimal(s).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-        except Exception:
-            return None
-
-    return None
-
-
-def to_float_number(value):
-    """Converte número texto/float em float (suporta pt-BR e EN)."""
-    if value is None or value == "" or value == "-":
-        return None
-
-    if isinstance(value, (int, float, np.integer, np.floating)):
-        v = float(value)
-        return v if np.isfinite(v) else None
-
-    if isinstance(value, str):
-        s = value.strip()
-        if not s:
-            return None
-        s = s.replace("%", "").replace("R$", "").strip()
-
-        # pt-BR (1.234,56)
-        if "," in s:
-            s = s.replace(".", "").replace(",", ".")
-        try:
-            v = float(s)
-            return v if np.isfinite(v) else None
-        except Exception:
-            return None
+def empty_mask(s: pd.Series) -> pd.Series:
+    """Marca células vazias (NaN ou texto de EMPTY_CELLS) numa passada só."""
+    mask = s.isna()
+    if s.dtype.kind not in "biufmM":
+        mask = mask | s.astype(str).str.strip().isin(EMPTY_CELLS)
+    return mask
 
-    try:
-        v = float(value)
-        return v if np.isfinite(v) else None
-    except Exception:
-        return None
+
+def text_mask(s: pd.Series) -> pd.Series:
+    """Marca as células que são texto (str)."""
+    # coluna string (pyarrow) => todo valor não-nulo é texto, sem map por célula
+    if pd.api.types.is_string_dtype(s.dtype) and s.dtype != object:
+        return s.notna()
+    return s.map(type) == str
 
 
-def fmt_efficiency(x):
+def money_to_float_series(s: pd.Series) -> pd.Series:
+    """
+    Converte coluna de moeda (float/int/str) para float com 2 casas.
+    - número do Excel => arredonda (evita bug de float)
+    - texto pt-BR ("R$ 1.234,56") => limpa e converte; inválido ("-") => 0.0
+    - célula vazia => continua vazia
+    """
+    if s.dtype.kind in "biuf":
+        values = s.astype(float)
+    else:
+        is_txt = text_mask(s)
+        values = pd.to_numeric(s.where(~is_txt), errors="coerce").astype(float)
+
+        # texto vazio ("-", "") => 0.0 direto, sem parse
+        blank = is_txt & empty_mask(s)
+        values[blank] = 0.0
+
+        todo = is_txt & ~blank
+        txt = (
+            s[todo]
+            .str.replace("R$", "", regex=False)
+            .str.strip()
+            .str.translate(BR_NUMBER_TABLE)
+        )
+        values[todo] = pd.to_numeric(txt, errors="coerce").fillna(0.0)
+
+    # arredonda 2 casas, meio pra cima (5182575.239999999 => 5182575.24)
+    arr = values.to_numpy(dtype=np.float64)
+    arr = np.sign(arr) * np.floor(np.abs(arr) * 100 + 0.5) / 100
+    return pd.Series(arr, index=values.index)
+
+
+def ctr_to_float_series(s: pd.Series) -> pd.Series:
+    """
+    CTR => float no padrão 0-1 (coluna inteira).
+    - texto aceita pt-BR ("12,3%") e EN ("0.123")
+    - se vier 12.3 (12,3%) => vira 0.123
+    - vazio/inválido => 0.0
+    - sai como float32
     """
-    Mantém eficiência como string legível:
+    if s.dtype.kind in "biuf":
+        n = s.astype(float)
+    else:
+        is_txt = text_mask(s)
+        n = pd.to_numeric(s.where(~is_txt), errors="coerce").astype(float)
+
+        txt = (
+            s[is_txt]
+            .str.replace("%", "", regex=False)
+            .str.replace("R$", "", regex=False)
+            .str.strip()
+        )
+        # pt-BR (1.234,56) só quando tem vírgula
+        br = txt.str.contains(",", regex=False)
+        txt = txt.where(~br, txt.str.translate(BR_NUMBER_TABLE))
+        # string[pyarrow] => to_numeric devolve Float64 (<NA>); vira float64 puro antes
+        n[is_txt] = pd.to_numeric(txt, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+
+    n = n.where(np.isfinite(n), 0.0)
+    n = n.where(n <= 1, n / 100.0)
+
+    # razão 0-1: float32 (7 dígitos) basta pra exibir 2 casas de % e encurta o JSON;
+    # moeda continua float64 (totais na casa dos milhões perderiam os centavos)
+    return n.astype(np.float32)
+
+
+def fmt_efficiency_series(s: pd.Series) -> pd.Series:
+    """
+    Mantém eficiência como string legível (coluna inteira):
     - se vier 0-1 => vira 0-100%
     - se vier 0-100 => mantém
+    - vazio/inválido => "-"
     """
-    if pd.isna(x) or x == "":
-        return "-"
-    try:
-        v = float(str(x).replace("%", "").replace(",", "."))
-        if 0 <= v <= 1:
-            v *= 100
-        return f"{v:.2f}".replace(".", ",") + "%"
-    except Exception:
-        return "-"
+    if s.dtype.kind in "biuf":
+        v = s.astype(float)
+    else:
+        # só converte o que não é vazio ("-" é o caso comum)
+        txt = (
+            s[~empty_mask(s)]
+            .astype(str)
+            .str.replace("%", "", regex=False)
+            .str.replace(",", ".", regex=False)
+        )
+        v = pd.to_numeric(txt, errors="coerce").reindex(s.index)
+
+    v = v.where(~((v >= 0) & (v <= 1)), v * 100)
+
+    ok = v.notna()
+    out = pd.Series("-", index=s.index, dtype=object)
+    if ok.any():
+        out[ok] = v[ok].map("{:.2f}".format).str.replace(".", ",", regex=False) + "%"
+    return out
 
 
 def json_safe(df: pd.DataFrame) -> pd.DataFrame:
-    """Converte tipos pandas/numpy para JSON-friendly."""
+    """Converte tipos pandas/numpy para JSON-friendly (coluna a coluna)."""
     def conv(v):
         if pd.isna(v):
             return ""
@@ -143,127 +214,338 @@ def json_safe(df: pd.DataFrame) -> pd.DataFrame:
             return float(v)
         return v
 
-    return df.applymap(conv)
+    cols = {}
+    for i, col in enumerate(df.columns):
+        s = df.iloc[:, i]
+        kind = s.dtype.kind
+
+        if kind in "biuf" and not s.hasnans:
+            # numérica sem vazio => fica como está (tolist já dá int/float nativos)
+            cols[i] = s
+        elif kind == "M":
+            cols[i] = s.dt.strftime("%Y-%m-%dT%H:%M:%S").fillna("")
+        elif kind in "biuf":
+            # NaN => "" exige coluna object
+            cols[i] = s.astype(object).where(s.notna(), "")
+        elif pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty"):
+            cols[i] = s.where(s.notna(), "")
+        else:
+            # coluna mista (ex.: datas soltas) => célula a célula
+            cols[i] = s.map(conv)
+
+    out = pd.DataFrame(cols, index=df.index)
+    out.columns = df.columns
+    return out
+
+
+def part_payload(df: pd.DataFrame) -> dict:
+    """
+    Parte em formato colunar: {"columns": [...], "data": [coluna0, coluna1, ...]}.
+    Nomes das colunas vão 1x (não repetidos em cada linha) e não se cria um
+    dict por linha; colunas numéricas vão como array numpy direto pro orjson.
+    """
+    data = []
+    for i in range(df.shape[1]):
+        s = df.iloc[:, i]
+        if s.dtype.kind in "biuf":
+            data.append(np.ascontiguousarray(s.to_numpy()))
+        else:
+            data.append(s.tolist())
+    return {"columns": [str(c) for c in df.columns], "data": data}
 
 
-def is_money_col(col_name: str) -> bool:
-    c = norm(col_name)
-    return ("r$" in c) or ("faturamento" in c) or (c == "cpc") or ("cpc" in c)
+def source_stamp(path: Path) -> str:
+    """Carimbo do Excel (tamanho + mtime) + tamanho de parte + versão do formato: muda => regenera."""
+    st = path.stat()
+    return f"{st.st_size}-{st.st_mtime_ns}-{ROWS_PER_PART}-v{FORMAT_VERSION}"
 
 
-def is_percent_col(col_name: str) -> bool:
-    c = norm(col_name)
-    return (c == "ctr") or ("ctr" in c)
+def payload_hash(payload: bytes) -> str:
+    """Hash curto dos bytes da parte (o que vai pro disco, não o DataFrame)."""
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
 
 
-# =========================
-# MAIN
-# =========================
-def main():
-    DOCS_DIR.mkdir(exist_ok=True)
-    DATA_DIR.mkdir(exist_ok=True)
-    ASSETS_DIR.mkdir(exist_ok=True)
+def load_previous_manifest() -> dict:
+    """Manifest da execução anterior (ou {} se não existir / estiver inválido)."""
+    path = DATA_DIR / "manifest.json"
+    try:
+        return orjson.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def dedup_columns(names: list[str]) -> list[str]:
+    """Renomeia cabeçalhos repetidos como o read_excel: "Clique", "Clique.1", ..."""
+    counts: dict[str, int] = {}
+    out = []
+    for name in names:
+        n = counts.get(name, 0)
+        while n > 0:
+            counts[name] = n + 1
+            name = f"{name}.{n}"
+            n = counts.get(name, 0)
+        out.append(name)
+        counts[name] = n + 1
+    return out
+
+
+def read_sheet(wb, sheet_name: str) -> pd.DataFrame:
+    """
+    Lê uma aba do workbook (aberto em read_only) como DataFrame.
+    Linha 1 = cabeçalho de grupo (ignorada), linha 2 = cabeçalho real.
+    """
+    ws = wb[sheet_name]
+    it = ws.iter_rows(values_only=True)
+
+    next(it, None)  # cabeçalho de grupo
+    header = next(it, None) or ()
+    header = dedup_columns([
+        f"Unnamed: {i}" if h is None else str(h)
+        for i, h in enumerate(header)
+    ])
+
+    # ignora linhas totalmente vazias (aba pode ter células soltas no fim,
+    # ~1M linhas em branco); comparar a tupla inteira roda em C
+    blank = (None,) * len(header)
+    rows = [r for r in it if r != blank]
+
+    df = pd.DataFrame(rows, columns=header)
+
+    for col in df.columns:
+        # mesma inferência do read_excel: coluna de texto 100% numérica vira número
+        # (pandas 3 entrega texto puro como "str", não object)
+        if not (
+            pd.api.types.is_numeric_dtype(df[col])
+            or pd.api.types.is_datetime64_any_dtype(df[col])
+        ):
+            # erro de fórmula / NA em texto => vazio, como no read_excel
+            na = df[col].isin(EXCEL_NA_CELLS)
+            if na.any():
+                df[col] = df[col].mask(na)
+
+            num = pd.to_numeric(df[col], errors="coerce")
+            if num.notna().sum() == df[col].notna().sum():
+                df[col] = num
+                continue
 
-    if not EXCEL_FILE.exists():
-        raise FileNotFoundError(EXCEL_FILE)
+        # texto puro => string[pyarrow] (buffer contíguo, .str roda no Arrow)
+        if pd.api.types.infer_dtype(df[col], skipna=True) == "string":
+            df[col] = df[col].astype("string[pyarrow]")
 
-    manifest = {
-        "generated_at": datetime.now().strftime("%d/%m/%Y %H:%M"),
-        "source": EXCEL_FILE.name,
-        "months": [],
-        "files": {}
-    }
+    return df
 
-    all_months = set()
 
-    for bu, sheet in SHEETS.items():
-        df = pd.read_excel(EXCEL_FILE, sheet_name=sheet, header=1)
+def is_money_col(col_name: str) -> bool:
+    return bool(MONEY_COL_RE.search(norm(col_name)))
 
-        # remove colunas Unnamed / vazias
-        df = df.loc[:, ~df.columns.astype(str).str.startswith("Unnamed")]
-        df = df.dropna(axis=1, how="all")
 
-        # ✅ fallback rename
-        if "CAD ENC" in df.columns and "Cad Totais" not in df.columns:
-            df = df.rename(columns={"CAD ENC": "Cad Totais"})
+def is_percent_col(col_name: str) -> bool:
+    return bool(PERCENT_COL_RE.search(norm(col_name)))
 
-        if "Data" not in df.columns:
-            continue
 
-        # data + mês
-        df["Data"] = df["Data"].map(fmt_date)
-        df["__month"] = df["Data"].map(ym_from_date_str)
+def col_kind(col_name: str) -> str:
+    """Classifica a coluna uma vez só: "eff", "money", "pct" ou "plain"."""
+    c = norm(col_name)
+    # norm é idempotente => predicados recebem o nome já normalizado
+    if "eficiencia" in c:
+        return "eff"
+    if is_money_col(c):
+        return "money"
+    if is_percent_col(c):
+        return "pct"
+    return "plain"
 
-        # remove linhas sem mês
-        df = df[df["__month"] != ""]
 
-        if df.empty:
-            continue
+# =========================
+# PROCESSAMENTO POR BU
+# =========================
+def process_sheet(
+    bu: str,
+    sheet: str,
+    prev_files: dict | None = None,
+    source_unchanged: bool = False,
+) -> tuple[str, dict | None, set[str]]:
+    """
+    Lê, formata e grava os JSON de uma BU (roda num processo próprio).
+    Retorna (bu, {mês: [partes]}, meses) — ou (bu, None, set()) se a aba não tiver dados.
 
-        # formata colunas
-        for col in df.columns:
-            if col == "__month":
-                continue
+    Incremental: com o Excel igual ao da última execução (source_unchanged) e as
+    partes ainda no disco, reaproveita prev_files sem abrir o Excel; senão, só
+    regrava as partes cujo hash mudou.
+    """
+    out_dir = DATA_DIR / bu
+    prev_files = prev_files or {}
 
-            c = norm(col)
+    if source_unchanged and prev_files and all(
+        (out_dir / p["file"]).exists() for parts in prev_files.values() for p in parts
+    ):
+        return bu, prev_files, set(prev_files)
 
-            if "eficiencia" in c:
-                # mantém string com %
-                df[col] = df[col].map(fmt_efficiency)
+    prev_hashes = {
+        p["file"]: p.get("hash") for parts in prev_files.values() for p in parts
+    }
 
-            elif is_money_col(col):
-                # moeda => float 2 casas
-                def _money_to_float(v):
-                    d = as_decimal_money(v)
-                    return float(d) if d is not None else 0.0
-                df[col] = df[col].map(_money_to_float)
+    # cada processo abre o próprio handle (read_only é barato; só esta aba é lida)
+    # keep_links=False => não carrega caches de vínculos externos a cada abertura
+    wb = load_workbook(EXCEL_FILE, read_only=True, data_only=True, keep_links=False)
+    try:
+        df = read_sheet(wb, sheet)
+    finally:
+        # read_only mantém o arquivo aberto até o close()
+        wb.close()
+
+    # remove colunas Unnamed / vazias (uma máscara, uma seleção só)
+    unnamed = np.fromiter(
+        (str(c).startswith("Unnamed") for c in df.columns), dtype=bool, count=df.shape[1]
+    )
+    nonempty = df.notna().any(axis=0).to_numpy()
+    df = df.loc[:, ~unnamed & nonempty]
+
+    # ✅ fallback rename
+    if "CAD ENC" in df.columns and "Cad Totais" not in df.columns:
+        df = df.rename(columns={"CAD ENC": "Cad Totais"})
+
+    if "Data" not in df.columns:
+        return bu, None, set()
+
+    # data + mês (linhas sem data válida saem antes de formatar)
+    dt = parse_datetime_series(df["Data"])
+    ok = dt.notna()
+    dt = dt[ok]
+    df = df.loc[ok].assign(
+        Data=dt.dt.strftime("%d/%m/%Y"),
+        __month=ym_from_dates(dt),
+    )
+
+    if df.empty:
+        return bu, None, set()
+
+    # classifica colunas uma vez por aba
+    kinds = {col: col_kind(col) for col in df.columns if col != "__month"}
+
+    # formata colunas (junta tudo e aplica num assign só)
+    transformed = {}
+    for col, kind in kinds.items():
+        if kind == "eff":
+            # mantém string com %
+            transformed[col] = fmt_efficiency_series(df[col])
+
+        elif kind == "money":
+            # moeda => float 2 casas
+            transformed[col] = money_to_float_series(df[col])
+
+        elif kind == "pct":
+            # CTR => manter numérico no JSON (padrão 0-1)
+            transformed[col] = ctr_to_float_series(df[col])
+
+    df = df.assign(**transformed)
+
+    df = json_safe(df)
+
+    files = {}
+    months = set()
+
+    # categoria => ordena/particiona por código inteiro, não por string
+    df["__month"] = df["__month"].astype("category")
+
+    # ordena 1x (estável => mantém a ordem original dentro do mês)
+    # e fatia blocos contíguos por mês, sem groupby
+    df = df.sort_values("__month", kind="stable")
+    month_key = df["__month"]
+    month_codes, starts = np.unique(month_key.cat.codes.to_numpy(), return_index=True)
+    bounds = [*starts, len(df)]
+
+    # tira a chave 1x (não a cada mês)
+    df = df.drop(columns="__month")
+
+    # pasta da BU criada 1x, não a cada mês
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    with ThreadPoolExecutor(max_workers=4) as writer:
+        pending = []
+
+        for k, code in enumerate(month_codes):
+            month = month_key.cat.categories[code]
+            g = df.iloc[bounds[k]:bounds[k + 1]]
+            months.add(month)
+
+            files[month] = []
+
+            # uma parte por vez: fatia, serializa, manda gravar
+            for i, lo in enumerate(range(0, len(g), ROWS_PER_PART), start=1):
+                part = g.iloc[lo:lo + ROWS_PER_PART]
+                fname = f"{month}_part{i}.json"
 
-            elif is_percent_col(col):
-                # CTR => manter numérico no JSON (padrão 0-1)
-                def _ctr_to_float(v):
-                    n = to_float_number(v)
-                    if n is None:
-                        return 0.0
-                    # se vier 12.3 (12,3%) => vira 0.123
-                    if n > 1:
-                        n = n / 100.0
-                    return float(n)
-                df[col] = df[col].map(_ctr_to_float)
+                # orjson => bytes UTF-8 direto, 1 write por arquivo;
+                # a escrita vai pra thread e a próxima parte já é serializada
+                # hash dos bytes (1 e "1" diferem) => parte igual à da última execução não grava
+                payload = orjson.dumps(part_payload(part), option=orjson.OPT_SERIALIZE_NUMPY)
+                part_hash = payload_hash(payload)
+                if prev_hashes.get(fname) != part_hash or not (out_dir / fname).exists():
+                    pending.append(writer.submit((out_dir / fname).write_bytes, payload))
 
-        df = json_safe(df)
+                files[month].append({
+                    "file": fname,
+                    "rows": len(part),
+                    "hash": part_hash
+                })
 
-        manifest["files"][bu] = {}
+        # propaga erro de escrita (disco cheio, permissão...)
+        for fut in pending:
+            fut.result()
 
-        for month, g in df.groupby("__month"):
-            all_months.add(month)
+    return bu, files, months
 
-            out_dir = DATA_DIR / bu
-            out_dir.mkdir(exist_ok=True)
 
-            rows = g.drop(columns="__month").to_dict(orient="records")
+# =========================
+# MAIN
+# =========================
+def main():
+    DOCS_DIR.mkdir(exist_ok=True)
+    DATA_DIR.mkdir(exist_ok=True)
+    ASSETS_DIR.mkdir(exist_ok=True)
 
-            parts = [
-                rows[i:i + ROWS_PER_PART]
-                for i in range(0, len(rows), ROWS_PER_PART)
-            ]
+    if not EXCEL_FILE.exists():
+        raise FileNotFoundError(EXCEL_FILE)
 
-            manifest["files"][bu][month] = []
+    prev = load_previous_manifest()
+    stamp = source_stamp(EXCEL_FILE)
+    source_unchanged = prev.get("source_stamp") == stamp
+    prev_files = [prev.get("files", {}).get(bu) for bu in SHEETS]
 
-            for i, part in enumerate(parts, start=1):
-                fname = f"{month}_part{i}.json"
+    manifest = {
+        "generated_at": datetime.now().strftime("%d/%m/%Y %H:%M"),
+        "source": EXCEL_FILE.name,
+        "source_stamp": stamp,
+        "months": [],
+        "files": {}
+    }
 
-                with open(out_dir / fname, "w", encoding="utf-8") as f:
-                    json.dump(part, f, ensure_ascii=False)
+    all_months = set()
 
-                manifest["files"][bu][month].append({
-                    "file": fname,
-                    "rows": len(part)
-                })
+    # as abas são independentes => 1 processo por BU (pandas não escala com threads)
+    workers = min(len(SHEETS), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        results = list(ex.map(
+            process_sheet,
+            SHEETS.keys(),
+            SHEETS.values(),
+            prev_files,
+            [source_unchanged] * len(SHEETS),
+        ))
+
+    for bu, files, months in results:
+        if files is None:
+            continue
+        manifest["files"][bu] = files
+        all_months |= months
 
     manifest["months"] = sorted(all_months)
 
-    with open(DATA_DIR / "manifest.json", "w", encoding="utf-8") as f:
-        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    # orjson também no manifest: bytes UTF-8 prontos, grava de uma vez
+    (DATA_DIR / "manifest.json").write_bytes(
+        orjson.dumps(manifest, option=orjson.OPT_INDENT_2)
+    )
 
     print("OK — dashboard gerado (CTR numérico, CPC numérico, rename CAD ENC -> Cad Totais)")
 
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+
+import gerar_dashboard as g
+
+
+def test_ctr_string_column_with_blanks():
+    s = pd.Series(["1,2%", "-", "12,3%", None], dtype="string[pyarrow]")
+    out = g.ctr_to_float_series(s)
+    assert out.dtype == np.float32
+    np.testing.assert_allclose(out.to_numpy(), [0.012, 0.0, 0.123, 0.0], rtol=1e-6)
+
+
+def make_wb(rows):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Aba"
+    for r in rows:
+        ws.append(r)
+    return wb
+
+
+def test_read_sheet_duplicate_headers_and_numeric_text():
+    wb = make_wb([
+        ("grupo", None, None),
+        ("Clique", "Clique", "Cod"),
+        (1, 2, "12"),
+        (3, 4, "30"),
+    ])
+    df = g.read_sheet(wb, "Aba")
+    assert list(df.columns) == ["Clique", "Clique.1", "Cod"]
+    assert df["Clique.1"].tolist() == [2, 4]
+    assert df["Cod"].dtype.kind == "i"
+
+
+def test_parse_datetime_mixed_formats_and_totals_row():
+    s = pd.Series(["15/01/2026", "2026-01-18", "JAN", "-"], dtype=object)
+    dt = g.parse_datetime_series(s)
+    assert dt.iloc[0] == pd.Timestamp(2026, 1, 15)
+    assert dt.iloc[1] == pd.Timestamp(2026, 1, 18)
+    assert dt.iloc[2:].isna().all()
+
+
+def test_col_kind_money():
+    assert g.col_kind("Investimento (R$)") == "money"
+    assert g.col_kind("CPC") == "money"
+    assert g.col_kind("Cidade RS") == "plain"
+
+
+def test_money_string_and_object_columns_agree():
+    vals = ["R$ 1.234,56", "-", None]
+    a = g.money_to_float_series(pd.Series(vals, dtype="string[pyarrow]"))
+    b = g.money_to_float_series(pd.Series(vals + [10.004], dtype=object))
+    assert a.tolist()[:2] == [1234.56, 0.0] and np.isnan(a.iloc[2])
+    assert b.tolist()[:2] == [1234.56, 0.0] and b.iloc[3] == 10.0
+
+
+def test_read_sheet_error_cells_become_blank():
+    wb = make_wb([
+        ("grupo", None, None),
+        ("Cliques", "Investimento R$", "Nome"),
+        (10, "#DIV/0!", "a"),
+        ("#N/A", 5.5, "#N/A"),
+    ])
+    df = g.read_sheet(wb, "Aba")
+    assert df["Cliques"].dtype.kind == "f"
+    assert df["Cliques"].iloc[0] == 10 and pd.isna(df["Cliques"].iloc[1])
+    assert pd.isna(df["Investimento R$"].iloc[0])
+    assert pd.isna(df["Nome"].iloc[1])
+    money = g.money_to_float_series(df["Investimento R$"])
+    assert np.isnan(money.iloc[0]) and money.iloc[1] == 5.5
+
+
+def test_process_sheet_rewrites_part_when_value_type_changes(tmp_path, monkeypatch):
+    xlsx = tmp_path / "t.xlsx"
+    monkeypatch.setattr(g, "EXCEL_FILE", xlsx)
+    monkeypatch.setattr(g, "DATA_DIR", tmp_path / "data")
+
+    def run(value, prev=None):
+        make_wb([
+            ("grupo", None, None),
+            ("Data", "Nome", "Cli"),
+            ("15/01/2026", "a", "x"),
+            ("16/01/2026", "b", value),
+        ]).save(xlsx)
+        return g.process_sheet("bu", "Aba", prev)[1]
+
+    files = run(1)
+    part = tmp_path / "data" / "bu" / "2026-01_part1.json"
+    before = part.read_bytes()
+
+    run("1", files)
+    assert part.read_bytes() != before
+
+
+def test_col_kind_percent():
+    for name in ("CTR", "CTR (%)", "CTRs", "vCTR", "CTRMedio"):
+        assert g.col_kind(name) == "pct"